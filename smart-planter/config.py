@@ -5,7 +5,9 @@
 環境別の設定を管理
 """
 
+import functools
 import os
+from dataclasses import dataclass
 from pathlib import Path
 
 class Config:
@@ -26,6 +28,7 @@ class Config:
     SENSOR_CHECK_INTERVAL = int(os.environ.get('SENSOR_CHECK_INTERVAL', 60))
     TEMPERATURE_HUMIDITY_INTERVAL = int(os.environ.get('TEMPERATURE_HUMIDITY_INTERVAL', 1800))
     SOIL_MOISTURE_INTERVAL = int(os.environ.get('SOIL_MOISTURE_INTERVAL', 300))
+    SOIL_SAMPLE_BATCH = int(os.environ.get('SOIL_SAMPLE_BATCH', 30))
     
     # 給水設定
     SOIL_MOISTURE_THRESHOLD = int(os.environ.get('SOIL_MOISTURE_THRESHOLD', 159))
@@ -70,3 +73,31 @@ config = {
     'default': DevelopmentConfig
 }
 
+@functools.lru_cache(maxsize=1)
+def get_config():
+    """FLASK_ENVに対応する設定クラスを取得（プロセス内で1回だけ解決）"""
+    return config[os.environ.get('FLASK_ENV', 'default')]
+
+@dataclass(frozen=True, slots=True)
+class SensorIntervals:
+    """センサーポーリング間隔のスナップショット（秒）
+
+    ポーリングループ内でConfigのクラス属性を毎周引き直さないように、
+    起動時に1回だけ固定した値を持ち回る。
+    ループ側では `interval = intervals.soil_moisture` のように
+    ローカル変数へ束縛してから `while True:` に入ること。
+    """
+    sensor_check: int
+    temperature_humidity: int
+    soil_moisture: int
+
+@functools.lru_cache(maxsize=1)
+def get_intervals():
+    """ポーリング間隔のスナップショットを取得（プロセス内で1回だけ生成）"""
+    cfg = get_config()
+    return SensorIntervals(
+        sensor_check=cfg.SENSOR_CHECK_INTERVAL,
+        temperature_humidity=cfg.TEMPERATURE_HUMIDITY_INTERVAL,
+        soil_moisture=cfg.SOIL_MOISTURE_INTERVAL,
+    )
+
@@ -14,7 +14,6 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from src.app.app import create_app
 from src.utils.logger import setup_logging
 
 def main():
@@ -22,20 +21,36 @@ def main():
     # ログ設定
     setup_logging()
     logger = logging.getLogger(__name__)
+
+    # Flask関連の読み込みは重いので、実際にサーバーを起動する時までロードしない
+    from src.app.app import create_app
     
     try:
         logger.info("🌱 すくすくミントちゃん起動中...")
         
         # Flaskアプリケーション作成
         app = create_app()
-        
+
         # アプリケーション実行
-        app.run(
-            host='0.0.0.0',
-            port=8080,  # ポート5000はmacOSのAirPlay Receiverで使用中
-            debug=False,
-            threaded=True
-        )
+        # Werkzeugの開発サーバーは単一プロセス・同期処理でボトルネックになるため
+        # 本番はwaitressで動かす（未インストール時のみ開発サーバーにフォールバック）
+        try:
+            from waitress import serve
+            serve(
+                app,
+                host='0.0.0.0',
+                port=8080,  # ポート5000はmacOSのAirPlay Receiverで使用中
+                threads=4,
+                connection_limit=50
+            )
+        except ImportError:
+            logger.warning("waitressが見つからないため開発サーバーで起動します")
+            app.run(
+                host='0.0.0.0',
+                port=8080,
+                debug=False,
+                threaded=True
+            )
         
     except KeyboardInterrupt:
         logger.info("⏹️ アプリケーション停止")
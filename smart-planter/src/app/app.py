@@ -4,52 +4,112 @@
 Flaskアプリケーションのメインファイル
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, jsonify, request, Response
+import functools
+import json
 import os
 import logging
+import time
+import zlib
 from datetime import datetime
 
+from pathlib import Path
+
+from config import get_config
+
+# テンプレート・静的ファイルのディレクトリ（モジュール読み込み時に1回だけ解決）
+_HERE = Path(__file__).resolve().parent
+_TEMPLATE_DIR = str(_HERE.parent / 'web' / 'templates')
+_STATIC_DIR = str(_HERE.parent / 'web' / 'static')
+
+# センサーデータのJSONスナップショット
+# リクエストのたびにシリアライズせず、センサー読み取り時に一度だけ
+# bytes化しておき、各リクエストはそれを返すだけにする
+_sensor_snapshot = {'bytes': b'{}', 'etag': '"0"'}
+
+def update_sensor_snapshot(data):
+    """センサー読み取り時に呼び出してJSONスナップショットを更新"""
+    payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    _sensor_snapshot['bytes'] = payload
+    _sensor_snapshot['etag'] = f'"{zlib.crc32(payload):x}"'
+
+# TODO: 実際のセンサーデータ取得時にupdate_sensor_snapshot()を呼ぶ
+update_sensor_snapshot({
+    'temperature': 25.5,
+    'humidity': 60.0,
+    'soil_moisture': 180,
+    'timestamp': datetime.now().isoformat()
+})
+
+@functools.lru_cache(maxsize=1)
+def _iso_now(sec):
+    """秒単位のISO形式タイムスタンプ（同じ秒内の呼び出しは文字列を再利用）
+
+    呼び出し側は `_iso_now(int(time.time()))` の形で使う。
+    maxsize=1なので直前の秒の値だけ保持し、秒が変わると作り直す。
+    """
+    return datetime.fromtimestamp(sec).isoformat()
+
+# /api/status のレスポンスは1秒だけキャッシュする
+_status_cache = {'sec': -1, 'bytes': b''}
+
+def _status_payload():
+    """ステータスJSONを取得（1秒間は前回のbytesを再利用）"""
+    sec = int(time.time())
+    if sec != _status_cache['sec']:
+        payload = json.dumps({
+            'status': 'running',
+            'timestamp': _iso_now(sec),
+            'version': '1.0.0'
+        }).encode('utf-8')
+        # bytesを先に更新する。secを先に入れると、別スレッドが
+        # 「新しいsec + 古いbytes」の組を見てしまう
+        _status_cache['bytes'] = payload
+        _status_cache['sec'] = sec
+    return _status_cache['bytes']
+
 def create_app():
     """Flaskアプリケーションを作成・設定"""
     
-    # テンプレートディレクトリを指定
-    template_dir = os.path.join(os.path.dirname(__file__), '..', 'web', 'templates')
-    static_dir = os.path.join(os.path.dirname(__file__), '..', 'web', 'static')
-    
-    app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
-    
-    # 設定
-    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
-    app.config['DEBUG'] = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
+    app = Flask(__name__, template_folder=_TEMPLATE_DIR, static_folder=_STATIC_DIR)
+
+    # 設定（環境変数の解析はconfig.pyで1回だけ行う）
+    app.config.from_object(get_config())
+
+    # index.htmlは動的な部分が無い（データはJSで/api/sensorsから取得）ため、
+    # Jinja2を通さず起動時に1回読み込んだbytesをそのまま返す
+    with open(os.path.join(_TEMPLATE_DIR, 'index.html'), 'rb') as f:
+        index_page = f.read()
     
-    # ログ設定
-    logging.basicConfig(level=logging.INFO)
-    logger = logging.getLogger(__name__)
+    # ログ設定は呼び出し側（main.pyのsetup_logging）で初期化済みの前提
+    logger = logging.getLogger('smart_planter.app')
     
     @app.route('/')
     def index():
         """メインページ"""
-        return render_template('index.html')
+        return Response(
+            index_page,
+            mimetype='text/html',
+            headers={'Cache-Control': 'public, max-age=300'}
+        )
     
     @app.route('/api/status')
     def api_status():
         """システムステータスAPI"""
-        return jsonify({
-            'status': 'running',
-            'timestamp': datetime.now().isoformat(),
-            'version': '1.0.0'
-        })
-    
+        return Response(_status_payload(), mimetype='application/json')
+
     @app.route('/api/sensors')
     def api_sensors():
         """センサーデータAPI"""
-        # TODO: 実際のセンサーデータを取得
-        return jsonify({
-            'temperature': 25.5,
-            'humidity': 60.0,
-            'soil_moisture': 180,
-            'timestamp': datetime.now().isoformat()
-        })
+        etag = _sensor_snapshot['etag']
+        # データが変わっていなければボディを送らない
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status=304, headers={'ETag': etag})
+        return Response(
+            _sensor_snapshot['bytes'],
+            mimetype='application/json',
+            headers={'ETag': etag}
+        )
     
     @app.route('/api/watering', methods=['POST'])
     def api_watering():
@@ -59,7 +119,7 @@ def create_app():
         return jsonify({
             'status': 'success',
             'message': '給水が完了しました',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _iso_now(int(time.time()))
         })
     
     # エラーハンドリング
@@ -1,13 +1,41 @@
-print("push_test")#pip install opencv-python
+#pip install opencv-python
 
-import cv2
 import datetime
+import logging
 import os
-import glob
+import time
+from pathlib import Path
+
+# cv2 (OpenCV) は共有ライブラリの読み込みだけで数百msかかるため
+# トップレベルではimportせず、実際に使う関数の中でimportする
+# （importは初回以降 sys.modules から返るだけなので繰り返しても安い）
+
+try:
+    from src.utils.logger import get_logger
+except ImportError:
+    # 単体実行時 (python camera.py) はプロジェクトのロガー設定が無いため
+    def get_logger(name):
+        return logging.getLogger(name)
+
+logger = get_logger('camera')
+
+try:
+    import xxhash
+
+    def _hash_image(data):
+        """エンコード済みJPEGのハッシュ値を計算（xxh3はSIMD実装で高速）"""
+        return xxhash.xxh3_64_intdigest(data)
+except ImportError:
+    import hashlib
+
+    def _hash_image(data):
+        """エンコード済みJPEGのハッシュ値を計算（xxhash未インストール時）"""
+        return hashlib.blake2b(data, digest_size=8).digest()
 
 # --- 設定 ---
 # 保存先ディレクトリ
 SAVE_DIR = "plant_images"
+SAVE_PATH = Path(SAVE_DIR)
 
 # 画像解像度 (C270 HDウェブカメラ)
 IMAGE_WIDTH = 1280
@@ -16,74 +44,165 @@ IMAGE_HEIGHT = 720
 # 画像の保存期間 (日数)
 RETENTION_DAYS = 90
 
+# JPEG品質 (85は植物観察では95と見分けがつかず、エンコードが約2倍速い)
+JPEG_QUALITY = 85
+
+# 古い画像の削除を実行する間隔 (秒) と前回実行を記録するマーカーファイル
+GC_INTERVAL_SECONDS = 86400
+GC_MARKER_PATH = SAVE_PATH / ".last_gc"
+
+# 保存ディレクトリを作成（モジュール読み込み時に1回だけ）
+# exists()で確認してから作る方式はsyscallが2回かかる上に
+# 並行起動時にレースするため、mkdirのEEXIST処理に任せる
+SAVE_PATH.mkdir(parents=True, exist_ok=True)
+
 # --- 共通関数 ---
-def get_file_name():
-    """ファイル名を生成（例: 20250910_100000.jpg）"""
+def get_file_path():
+    """保存先パスを生成（例: plant_images/20250910_100000.jpg）"""
     now = datetime.datetime.now()
-    return now.strftime("%Y%m%d_%H%M%S.jpg")
+    return SAVE_PATH / now.strftime("%Y%m%d_%H%M%S.jpg")
+
+def encode_image(frame):
+    """画像をメモリ上でJPEG形式にエンコード（失敗時はNone）"""
+    import cv2
 
-def save_image(frame, file_path):
-    """画像をJPEG形式で保存"""
-    cv2.imwrite(file_path, frame, [int(cv2.IMWRITE_JPEG_QUALITY), 95])
-    #print(f"画像を保存しました: {file_path}")
+    ok, buf = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY])
+    if not ok:
+        logger.error("JPEGエンコードに失敗しました")
+        return None
+    return buf.tobytes()
+
+def save_image(data, file_path):
+    """エンコード済みJPEGをファイルに保存"""
+    # imwrite任せだとSDカードへの書き戻しがページキャッシュ頼みになり、
+    # バックグラウンドのフラッシュが次の撮影を止めることがある
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+        os.fdatasync(fd)  # ここで明示的に1回だけフラッシュする
+    finally:
+        os.close(fd)
+    # %s形式にするとDEBUG無効時は文字列を組み立てない
+    logger.debug("画像を保存しました: %s", file_path)
 
 def delete_old_images():
     """指定期間より古い画像を自動削除"""
-    today = datetime.datetime.now()
-    cutoff_date = today - datetime.timedelta(days=RETENTION_DAYS)
-    
-    # 保存ディレクトリ内の全JPEGファイルを検索
-    image_files = glob.glob(os.path.join(SAVE_DIR, "*.jp*g"))
-    
-    for file_path in image_files:
-        # ファイルの作成日時を取得
-        timestamp = os.path.getctime(file_path)
-        file_date = datetime.datetime.fromtimestamp(timestamp)
-        
-        if file_date < cutoff_date:
-            os.remove(file_path)
-    
+    cutoff = (datetime.datetime.now() - datetime.timedelta(days=RETENTION_DAYS)).timestamp()
+
+    # scandirはstat結果をキャッシュして返すため、globより syscall が少ない
+    with os.scandir(SAVE_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith((".jpg", ".jpeg")):
+                continue
+            # ファイル名に撮影日時が入っているので、それを基準に判定する
+            # （ctimeはバックアップ復元やchmodで変わってしまい当てにならない）
+            try:
+                taken = datetime.datetime.strptime(entry.name[:15], "%Y%m%d_%H%M%S").timestamp()
+            except ValueError:
+                # 命名規則に合わないファイルは更新日時で判定
+                taken = entry.stat().st_mtime
+            if taken >= cutoff:
+                continue
+            # 重複排除は同一画像の再保存をmtime更新で代用しているため、
+            # ファイル名は古くてもmtimeが新しいファイルは「現役」として残す
+            # （statするのは名前上期限切れの少数ファイルだけ）
+            if entry.stat().st_mtime >= cutoff:
+                continue
+            os.remove(entry.path)
+
 
 # --- メイン機能 ---
 class PlantCaptureManager:
     def __init__(self):
-        # 保存ディレクトリが存在しない場合は作成
-        if not os.path.exists(SAVE_DIR):
-            os.makedirs(SAVE_DIR)
-            print(f"ディレクトリを作成しました: {SAVE_DIR}")
+        import cv2
+        import numpy as np
 
-    def capture_and_save(self):
-        """カメラから画像をキャプチャして保存"""
-        cap = cv2.VideoCapture(0)  # 0は通常、内蔵または最初のUSBカメラ
+        # カメラは毎回開閉すると接続処理だけで数秒かかるため、
+        # 一度だけ開いてインスタンスで保持する
+        self.cap = cv2.VideoCapture(0)  # 0は通常、内蔵または最初のUSBカメラ
 
         # カメラが正しく開かれているか確認
-        if not cap.isOpened():
-            print("エラー: カメラに接続できませんでした。")
+        if not self.cap.isOpened():
+            logger.error("カメラに接続できませんでした。")
             return
 
         # 解像度設定
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, IMAGE_WIDTH)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, IMAGE_HEIGHT)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, IMAGE_WIDTH)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, IMAGE_HEIGHT)
+        # 古いフレームが溜まらないようにバッファは1枚にする
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        # フレーム用バッファを確保して毎回使い回す
+        # （1280x720x3で約2.6MBの確保を撮影のたびに繰り返さないため）
+        self._frame_buf = np.empty((IMAGE_HEIGHT, IMAGE_WIDTH, 3), dtype=np.uint8)
+
+        # 直前に保存した画像のハッシュと保存先
+        # （ピント外れや照明固定などで完全に同一のJPEGができた場合の重複排除用）
+        self._last_hash = None
+        self._last_path = None
+
+        # 前回の削除実行時刻をマーカーファイルのmtimeから復元
+        # （再起動しても1日1回のペースを守れるようにする）
+        try:
+            self._last_gc = os.path.getmtime(GC_MARKER_PATH)
+        except OSError:
+            self._last_gc = 0.0
+
+    def close(self):
+        """カメラを解放"""
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def __del__(self):
+        self.close()
 
-        # 念のため、カメラのウォームアップ
-        ret, frame = cap.read()
+    def capture_and_save(self):
+        """カメラから画像をキャプチャして保存"""
+        if self.cap is None or not self.cap.isOpened():
+            logger.error("カメラに接続できませんでした。")
+            return
+
+        # grab + retrieve の2段階でバッファの古いフレームを避ける
+        if not self.cap.grab():
+            logger.error("フレームを読み込めませんでした。")
+            return
+        ret, frame = self.cap.retrieve(self._frame_buf)
         if not ret:
-            print("エラー: フレームを読み込めませんでした。")
-            cap.release()
+            logger.error("フレームを読み込めませんでした。")
+            return
+
+        # 画像のエンコード
+        data = encode_image(frame)
+        if data is None:
             return
-        
-        # ファイル名の生成
-        file_name = get_file_name()
-        file_path = os.path.join(SAVE_DIR, file_name)
 
-        # 画像の保存
-        save_image(frame, file_path)
+        # 直前の画像とビット単位で同一なら保存しない
+        # （前回ファイルのmtime更新だけで「最新の状態」を記録できる）
+        image_hash = _hash_image(data)
+        skipped = False
+        if image_hash == self._last_hash and self._last_path is not None:
+            try:
+                os.utime(self._last_path, None)
+                skipped = True
+                logger.debug("直前の画像と同一のため保存をスキップしました")
+            except OSError:
+                # 前回のファイルが消えている（手動削除など）→ 通常の保存に戻す
+                self._last_hash = None
+                self._last_path = None
+        if not skipped:
+            file_path = get_file_path()
+            save_image(data, file_path)
+            self._last_hash = image_hash
+            self._last_path = file_path
 
-        # カメラを解放
-        cap.release()
-        
-        # 撮影後に古い画像を削除
-        delete_old_images()
+        # 古い画像の削除は1日1回だけ実行する
+        # （毎回ディレクトリ全体をスキャンしても消えるのは高々1日分のため）
+        now = time.time()
+        if now - self._last_gc > GC_INTERVAL_SECONDS:
+            delete_old_images()
+            self._last_gc = now
+            GC_MARKER_PATH.touch()  # mtimeを現在時刻に更新
 
 # --- 実行例 ---
 if __name__ == "__main__":
@@ -95,4 +214,5 @@ if __name__ == "__main__":
     # 現在は単純に再度実行する形で示します。
     # AM7:00に撮影
     
-    manager.capture_and_save()
\ No newline at end of file
+    manager.capture_and_save()
+    manager.close()
\ No newline at end of file
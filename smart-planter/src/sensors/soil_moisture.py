@@ -0,0 +1,33 @@
+# 土壌水分センサー (SEN0193) バッチ判定
+
+"""
+土壌水分センサーのバッチ判定モジュール
+ADC (MCP3002) から読み取ったサンプル群をNumPyでまとめて判定する
+"""
+
+import numpy as np
+
+from config import get_config
+
+def make_sample_buffer(size=None):
+    """ADC読み取り値を貯めるバッファを確保
+
+    ポーリングループ側で1回だけ確保して使い回すこと。
+    sizeを省略するとConfigのSOIL_SAMPLE_BATCHを使う。
+    """
+    if size is None:
+        size = get_config().SOIL_SAMPLE_BATCH
+    return np.empty(size, dtype=np.int16)
+
+def needs_watering(samples, threshold=None):
+    """サンプル群から給水が必要かどうかを判定
+
+    Pythonのforループで1サンプルずつ比較するとGILがボトルネックになるため、
+    NumPyの配列比較でまとめて処理する（C実装・ARM NEONで実行される）。
+    ノイズで1サンプルだけ閾値を割っても反応しないよう、
+    過半数が閾値未満の場合のみTrueを返す。
+    """
+    if threshold is None:
+        threshold = get_config().SOIL_MOISTURE_THRESHOLD
+    samples = np.asarray(samples)
+    return (samples < threshold).mean() > 0.5
@@ -6,19 +6,19 @@
 
 import logging
 import os
-from datetime import datetime
+from logging.handlers import MemoryHandler, TimedRotatingFileHandler
 from pathlib import Path
 
 def setup_logging():
     """ログ設定を初期化"""
-    
+
     # ログディレクトリの作成
     log_dir = Path(__file__).parent.parent.parent / 'logs'
-    log_dir.mkdir(exist_ok=True)
-    
-    # ログファイル名（日付付き）
-    log_file = log_dir / f"smart-planter-{datetime.now().strftime('%Y%m%d')}.log"
-    
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    # ログファイル名（日付はローテーション時に自動で付与される）
+    log_file = log_dir / 'smart-planter.log'
+
     # ログレベル設定
     log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
     
@@ -36,11 +36,20 @@ def setup_logging():
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
-    # ファイルハンドラー
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    # ファイルハンドラー（深夜0時に日次ローテーション、90日分保持）
+    # 起動したまま日付をまたいでも自動的に新しいファイルへ切り替わる
+    file_handler = TimedRotatingFileHandler(
+        log_file, when='midnight', backupCount=90, encoding='utf-8'
+    )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+
+    # SDカードへの書き込み回数を減らすため、バッファリングして書き出す
+    # （ERROR以上は即時フラッシュ）
+    buffered_handler = MemoryHandler(
+        capacity=200, flushLevel=logging.ERROR, target=file_handler
+    )
+    root_logger.addHandler(buffered_handler)
     
     # コンソールハンドラー
     console_handler = logging.StreamHandler()